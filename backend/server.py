@@ -1,26 +1,291 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+import bson
+from pymongo import monitoring, ReturnDocument, UpdateOne, ReplaceOne, CursorType
+from pymongo.errors import CollectionInvalid
 import os
+import io
+import abc
+import asyncio
 import logging
+import threading
+import time
+import random
+from collections import OrderedDict, deque
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 import jwt
+import pandas as pd
 from passlib.context import CryptContext
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+# MongoDB connection pool monitoring
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Tracks connection pool state for the health and readiness probes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open = 0
+        self.checked_out = 0
+        self.created = 0
+        self.closed = 0
+        self.checkout_failures = 0
+        self.cleared = 0
+
+    def _bump(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "open": self.open,
+                "checked_out": self.checked_out,
+                "idle": self.open - self.checked_out,
+                "created": self.created,
+                "closed": self.closed,
+                "checkout_failures": self.checkout_failures,
+                "cleared": self.cleared,
+            }
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._bump(cleared=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._bump(open=1, created=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._bump(open=-1, closed=1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._bump(checkout_failures=1)
+
+    def connection_checked_out(self, event):
+        self._bump(checked_out=1)
+
+    def connection_checked_in(self, event):
+        self._bump(checked_out=-1)
+
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+MONGO_MIN_POOL_SIZE = int(os.environ.get('MONGO_MIN_POOL_SIZE', 5))
+pool_monitor = PoolMonitor()
+client = AsyncIOMotorClient(
+    mongo_url,
+    minPoolSize=MONGO_MIN_POOL_SIZE,
+    event_listeners=[pool_monitor],
+)
 db = client[os.environ['DB_NAME']]
 
+# Hot entity cache
+class EntityCache:
+    """LRU + TTL cache of documents by id, shared by all requests in a worker.
+
+    Entries larger than `max_entry_bytes` (BSON size) are never stored, so the
+    cache holds at most `max_entries * max_entry_bytes`. Concurrent misses for
+    the same id share one in-flight fetch. Returned documents are shared
+    between callers and must be treated as read-only.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl: float, max_entry_bytes: int):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._fetches = set()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.oversize = 0
+        self.invalidations = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": sum(size for _, size, _ in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "oversize": self.oversize,
+            "invalidations": self.invalidations,
+        }
+
+    async def get_many(
+        self, keys: List[str], loader: Callable[[List[str]], Awaitable[Dict[str, dict]]]
+    ) -> Dict[str, Optional[dict]]:
+        """Return cached documents for `keys`, fetching the misses with a
+        single `loader(missing_keys)` call that maps key -> document."""
+        found: Dict[str, Optional[dict]] = {}
+        waiting: Dict[str, asyncio.Future] = {}
+        missing: Dict[str, asyncio.Future] = {}
+        now = time.monotonic()
+        for key in dict.fromkeys(keys):
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, _, doc = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    found[key] = doc
+                    continue
+                del self._entries[key]
+
+            self.misses += 1
+            future = self._inflight.get(key)
+            if future is None:
+                future = asyncio.get_running_loop().create_future()
+                self._inflight[key] = future
+                missing[key] = future
+            else:
+                self.coalesced += 1
+            waiting[key] = future
+
+        if missing:
+            # The fetch runs as its own task so that a caller which is
+            # cancelled (e.g. client disconnect) doesn't fail the others.
+            fetch = asyncio.ensure_future(self._fetch(missing, loader))
+            self._fetches.add(fetch)
+            fetch.add_done_callback(self._fetches.discard)
+
+        for key, future in waiting.items():
+            found[key] = await asyncio.shield(future)
+        return found
+
+    async def get(self, key: str, loader: Callable[[], Awaitable[Optional[dict]]]) -> Optional[dict]:
+        async def load(keys: List[str]) -> Dict[str, dict]:
+            doc = await loader()
+            return {key: doc} if doc is not None else {}
+        return (await self.get_many([key], load))[key]
+
+    async def _fetch(self, futures: Dict[str, asyncio.Future], loader: Callable[[List[str]], Awaitable[Dict[str, dict]]]):
+        try:
+            docs = await loader(list(futures))
+        except Exception as e:
+            docs, error = {}, e
+        else:
+            error = None
+        for key, future in futures.items():
+            # If the key was invalidated meanwhile, a newer fetch may already
+            # own the slot, and this document may predate the write.
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+                if error is None and key in docs:
+                    self._store(key, docs[key])
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(docs.get(key))
+
+    def _store(self, key: str, doc: dict):
+        size = len(bson.encode(doc))
+        if size > self.max_entry_bytes:
+            self.oversize += 1
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, size, doc)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: str):
+        self.invalidations += 1
+        self._entries.pop(key, None)
+        # Callers after the write must not join a fetch that started before it
+        self._inflight.pop(key, None)
+
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 1000))
+CACHE_TTL_SECONDS = float(os.environ.get('CACHE_TTL_SECONDS', 30))
+CACHE_MAX_ENTRY_BYTES = int(os.environ.get('CACHE_MAX_ENTRY_BYTES', 64 * 1024))
+# Set to share invalidations between workers through a capped collection
+CACHE_INVALIDATION_CHANNEL = os.environ.get('CACHE_INVALIDATION_CHANNEL', '').lower() in ('1', 'true', 'yes')
+CACHE_INVALIDATION_COLLECTION = "cache_invalidations"
+WORKER_ID = str(uuid.uuid4())
+
+entity_caches = {
+    name: EntityCache(name, CACHE_MAX_ENTRIES, CACHE_TTL_SECONDS, CACHE_MAX_ENTRY_BYTES)
+    for name in ("events", "businesses", "users")
+}
+
+async def invalidate_cached(collection: str, entity_ids: List[str]):
+    cache = entity_caches[collection]
+    for entity_id in entity_ids:
+        cache.invalidate(entity_id)
+    if CACHE_INVALIDATION_CHANNEL and entity_ids:
+        await db[CACHE_INVALIDATION_COLLECTION].insert_one(
+            {"collection": collection, "ids": entity_ids, "origin": WORKER_ID}
+        )
+
+async def listen_for_invalidations():
+    # Capped collections keep insertion order and support tailable cursors,
+    # which gives a pub/sub channel without needing a replica set.
+    try:
+        await db.create_collection(CACHE_INVALIDATION_COLLECTION, capped=True, size=1024 * 1024)
+    except CollectionInvalid:
+        pass
+
+    # ObjectIds are generated by each client and aren't ordered across
+    # workers, so position is tracked in insertion ($natural) order instead:
+    # every (re)start tails from the beginning and skips up to the last
+    # message already seen. Messages from before startup don't matter, the
+    # cache is empty then.
+    channel = db[CACHE_INVALIDATION_COLLECTION]
+    last = await channel.find_one({}, sort=[("$natural", -1)])
+    last_id = last["_id"] if last else None
+    while True:
+        try:
+            # If the last message was already overwritten, replay everything;
+            # extra invalidations are harmless, missed ones are not.
+            skipping = last_id is not None and await channel.find_one({"_id": last_id}) is not None
+            cursor = channel.find({}, cursor_type=CursorType.TAILABLE_AWAIT)
+            async for message in cursor:
+                if skipping:
+                    skipping = message["_id"] != last_id
+                    continue
+                last_id = message["_id"]
+                if message["origin"] != WORKER_ID and message["collection"] in entity_caches:
+                    cache = entity_caches[message["collection"]]
+                    for entity_id in message["ids"]:
+                        cache.invalidate(entity_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Cache invalidation listener failed, restarting")
+        # A tailable cursor dies when it runs off an empty collection
+        await asyncio.sleep(1)
+
 # Create the main app without a prefix
 app = FastAPI()
 
@@ -46,6 +311,7 @@ class User(BaseModel):
     role: str
     organization: Optional[str] = None
     phone: Optional[str] = None
+    version: int = 1
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 class UserCreate(BaseModel):
@@ -60,6 +326,12 @@ class UserLogin(BaseModel):
     email: str
     password: str
 
+class UserUpdate(BaseModel):
+    version: int
+    name: Optional[str] = None
+    organization: Optional[str] = None
+    phone: Optional[str] = None
+
 # Business Models
 class Business(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -72,6 +344,7 @@ class Business(BaseModel):
     employees_count: Optional[int] = None
     products: List[str] = []
     image_url: Optional[str] = None
+    version: int = 1
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 class BusinessCreate(BaseModel):
@@ -84,6 +357,17 @@ class BusinessCreate(BaseModel):
     products: List[str] = []
     image_url: Optional[str] = None
 
+class BusinessUpdate(BaseModel):
+    version: int
+    name: Optional[str] = None
+    description: Optional[str] = None
+    category: Optional[str] = None
+    location: Optional[str] = None
+    revenue_range: Optional[str] = None
+    employees_count: Optional[int] = None
+    products: Optional[List[str]] = None
+    image_url: Optional[str] = None
+
 # Event Models
 class EventBusiness(BaseModel):
     business_id: str
@@ -105,6 +389,7 @@ class Event(BaseModel):
     invited_corporates: List[str] = []
     connections_made: List[dict] = []
     status: str = "upcoming"  # upcoming, ongoing, completed
+    version: int = 1
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 class EventCreate(BaseModel):
@@ -117,6 +402,18 @@ class EventCreate(BaseModel):
     participating_businesses: List[EventBusiness] = []
     invited_corporates: List[str] = []
 
+class EventUpdate(BaseModel):
+    version: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    initiative_type: Optional[str] = None
+    date: Optional[datetime] = None
+    location: Optional[str] = None
+    target_audience: Optional[str] = None
+    status: Optional[str] = None
+    participating_business_ids: Optional[List[str]] = None
+    invited_corporates: Optional[List[str]] = None
+
 # Connection Models
 class Connection(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -132,6 +429,81 @@ class ConnectionCreate(BaseModel):
     business_id: str
     notes: Optional[str] = None
 
+# Request-scoped batch loading
+MAX_BATCH_IDS = 1000
+
+async def find_by_ids(collection: str, entity_ids: List[str]) -> Dict[str, dict]:
+    docs = await db[collection].find({"id": {"$in": entity_ids}}).to_list(len(entity_ids))
+    return {doc["id"]: doc for doc in docs}
+
+class RequestLoader:
+    """Collects the by-id lookups made while a request runs into one `$in`
+    query per collection, DataLoader style.
+
+    Lookups issued in the same event loop tick are dispatched together, and
+    each id is fetched at most once per request. Collections with an entity
+    cache are served from it first, and only the misses are queried. Obtain
+    one per request with `Depends(get_loader)`; `get_current_user` shares the
+    route's instance.
+    """
+
+    def __init__(self):
+        self._futures: Dict[str, Dict[str, asyncio.Future]] = {}
+        self._pending: Dict[str, Dict[str, asyncio.Future]] = {}
+        self._dispatches = set()
+
+    def load(self, collection: str, entity_id: str) -> Awaitable[Optional[dict]]:
+        futures = self._futures.setdefault(collection, {})
+        future = futures.get(entity_id)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            futures[entity_id] = future
+            if not self._pending:
+                # The task's first step runs on the next loop iteration, after
+                # every load() issued in this one has joined the batch.
+                dispatch = asyncio.ensure_future(self._dispatch())
+                self._dispatches.add(dispatch)
+                dispatch.add_done_callback(self._dispatches.discard)
+            self._pending.setdefault(collection, {})[entity_id] = future
+        # Shielded so one cancelled caller doesn't cancel the memoized result
+        return asyncio.shield(future)
+
+    def load_many(self, collection: str, entity_ids: List[str]) -> Awaitable[List[Optional[dict]]]:
+        # Not a coroutine: the ids must join the pending batch right away, not
+        # when the caller's await first runs.
+        return asyncio.gather(*(self.load(collection, i) for i in entity_ids))
+
+    async def _dispatch(self):
+        pending, self._pending = self._pending, {}
+        await asyncio.gather(*(self._fetch(c, futures) for c, futures in pending.items()))
+
+    async def _fetch(self, collection: str, futures: Dict[str, asyncio.Future]):
+        try:
+            if collection in entity_caches:
+                docs = await entity_caches[collection].get_many(
+                    list(futures), lambda ids: find_by_ids(collection, ids)
+                )
+            else:
+                docs = await find_by_ids(collection, list(futures))
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for entity_id, future in futures.items():
+            if not future.done():
+                future.set_result(docs.get(entity_id))
+
+async def get_loader() -> RequestLoader:
+    return RequestLoader()
+
+def parse_ids(ids: str) -> List[str]:
+    # Comma separated, order preserved, duplicates dropped
+    parsed = list(dict.fromkeys(i.strip() for i in ids.split(",") if i.strip()))
+    if len(parsed) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request")
+    return parsed
+
 # Utility functions
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
@@ -144,14 +516,17 @@ def create_access_token(data: dict):
     token = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return token
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    loader: RequestLoader = Depends(get_loader),
+):
     try:
         payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=401, detail="Invalid token")
         
-        user = await db.users.find_one({"id": user_id})
+        user = await loader.load("users", user_id)
         if user is None:
             raise HTTPException(status_code=401, detail="User not found")
         
@@ -159,6 +534,398 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+async def apply_versioned_update(collection: str, entity_id: str, version: int, changes: dict) -> dict:
+    """Apply `changes` only if the stored document is still at `version`.
+
+    Documents written before versioning have no `version` field and are
+    treated as version 1.
+    """
+    if not changes:
+        raise HTTPException(status_code=400, detail="No fields to update")
+
+    version_filter = {"version": version}
+    if version == 1:
+        version_filter = {"$or": [{"version": 1}, {"version": {"$exists": False}}]}
+
+    updated = await db[collection].find_one_and_update(
+        {"id": entity_id, **version_filter},
+        {"$set": {**changes, "version": version + 1}},
+        return_document=ReturnDocument.AFTER,
+    )
+    if updated is None:
+        raise HTTPException(status_code=409, detail="Version conflict, reload and retry")
+    await invalidate_cached(collection, [entity_id])
+    return updated
+
+# Denormalized data fan-out
+FANOUT_BATCH_SIZE = int(os.environ.get('FANOUT_BATCH_SIZE', 200))
+EMBEDDED_BUSINESS_FIELDS = {"name": "business_name", "description": "description", "category": "category"}
+
+async def fan_out_to_events(match: dict, update: dict, array_filters: Optional[List[dict]] = None):
+    """Apply `update` to every event matching `match`, FANOUT_BATCH_SIZE at a time.
+
+    Each batch goes out as a single unordered bulk_write so a large fan-out
+    never holds more than one batch of ids or ties up the server in one
+    unbounded multi-document write.
+    """
+    cursor = db.events.find(match, {"id": 1, "_id": 0}).batch_size(FANOUT_BATCH_SIZE)
+    modified = 0
+    while True:
+        batch = await cursor.to_list(length=FANOUT_BATCH_SIZE)
+        if not batch:
+            break
+        requests = [UpdateOne({"id": e["id"]}, update, array_filters=array_filters) for e in batch]
+        result = await db.events.bulk_write(requests, ordered=False)
+        modified += result.modified_count
+        await invalidate_cached("events", [e["id"] for e in batch])
+    return modified
+
+async def embed_businesses(business_ids: List[str]) -> List[dict]:
+    # Embedded copies always come from db.businesses, never from the client,
+    # so a form loaded before a fan-out can't write the old values back.
+    businesses = await db.businesses.find({"id": {"$in": business_ids}}).to_list(len(business_ids))
+    by_id = {b["id"]: b for b in businesses}
+    missing = [i for i in business_ids if i not in by_id]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Unknown business: {missing[0]}")
+    return [
+        {"business_id": i, **{embedded: by_id[i][field] for field, embedded in EMBEDDED_BUSINESS_FIELDS.items()}}
+        for i in business_ids
+    ]
+
+# Notifications
+class Notifier(abc.ABC):
+    """Delivers a notification to a user. Subclass to plug in email, SMS, etc."""
+
+    @abc.abstractmethod
+    async def send(self, user_id: str, subject: str, message: str):
+        ...
+
+class LogNotifier(Notifier):
+    async def send(self, user_id: str, subject: str, message: str):
+        logger.info("Notify %s: %s - %s", user_id, subject, message)
+
+class InMemoryNotifier(Notifier):
+    """Records notifications instead of delivering them, for local runs and tests."""
+
+    def __init__(self):
+        self.sent: List[dict] = []
+
+    async def send(self, user_id: str, subject: str, message: str):
+        self.sent.append({"user_id": user_id, "subject": subject, "message": message})
+
+NOTIFIERS = {"log": LogNotifier, "memory": InMemoryNotifier}
+notifier: Notifier = NOTIFIERS[os.environ.get('NOTIFIER', 'log')]()
+
+# Background jobs
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+JOB_LEASE_SECONDS = float(os.environ.get('JOB_LEASE_SECONDS', 60))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', 5))
+JOB_BACKOFF_BASE_SECONDS = float(os.environ.get('JOB_BACKOFF_BASE_SECONDS', 2))
+JOB_BACKOFF_MAX_SECONDS = float(os.environ.get('JOB_BACKOFF_MAX_SECONDS', 300))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 1))
+
+class JobQueue:
+    """Durable job queue in `db.jobs`, drained by a pool of asyncio workers.
+
+    A worker leases a job by atomically marking it running until
+    `lease_expires_at`; if the process dies the lease lapses and another
+    worker picks the job up. Failed jobs are retried with exponential backoff
+    and moved to `db.dead_jobs` once `max_attempts` is used up. Completed
+    jobs are deleted.
+    """
+
+    def __init__(self):
+        self.handlers: Dict[str, Callable[[dict], Awaitable[None]]] = {}
+        self.workers: List[asyncio.Task] = []
+        self.enqueued = 0
+        self.completed = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self._completions = deque()
+        self._lags = deque(maxlen=100)
+
+    def handler(self, job_type: str):
+        def register(func):
+            self.handlers[job_type] = func
+            return func
+        return register
+
+    def stats(self) -> dict:
+        cutoff = time.monotonic() - 60
+        while self._completions and self._completions[0] < cutoff:
+            self._completions.popleft()
+        lags = list(self._lags)
+        return {
+            "workers": len(self.workers),
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "retried": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "completed_last_minute": len(self._completions),
+            "lag_seconds_avg": round(sum(lags) / len(lags), 3) if lags else 0.0,
+            "lag_seconds_max": round(max(lags), 3) if lags else 0.0,
+        }
+
+    async def enqueue(self, job_type: str, payload: dict, max_attempts: int = JOB_MAX_ATTEMPTS):
+        await self.enqueue_many(job_type, [payload], max_attempts)
+
+    async def enqueue_many(self, job_type: str, payloads: List[dict], max_attempts: int = JOB_MAX_ATTEMPTS):
+        if not payloads:
+            return
+        now = datetime.utcnow()
+        await db.jobs.insert_many([
+            {
+                "id": str(uuid.uuid4()),
+                "type": job_type,
+                "payload": payload,
+                "status": "queued",
+                "attempts": 0,
+                "max_attempts": max_attempts,
+                "run_at": now,
+                "lease_expires_at": None,
+                "last_error": None,
+                "created_at": now,
+            }
+            for payload in payloads
+        ])
+        self.enqueued += len(payloads)
+
+    async def lease(self) -> Optional[dict]:
+        now = datetime.utcnow()
+        return await db.jobs.find_one_and_update(
+            {"$or": [
+                {"status": "queued", "run_at": {"$lte": now}},
+                {"status": "running", "lease_expires_at": {"$lte": now}},
+            ]},
+            {
+                "$set": {
+                    "status": "running",
+                    "leased_by": WORKER_ID,
+                    "lease_expires_at": now + timedelta(seconds=JOB_LEASE_SECONDS),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def run_job(self, job: dict):
+        # Guard on our lease so a job that outlived it and was re-leased
+        # elsewhere isn't completed or rescheduled twice.
+        lease = {"id": job["id"], "leased_by": WORKER_ID, "attempts": job["attempts"]}
+        self._lags.append((datetime.utcnow() - job["run_at"]).total_seconds())
+
+        if job["attempts"] > job["max_attempts"]:
+            # Lease lapsed on every attempt, e.g. the handler keeps killing the worker
+            await self.dead_letter(job, lease, job.get("last_error") or "Lease expired")
+            return
+
+        try:
+            handler = self.handlers[job["type"]]
+            await asyncio.wait_for(handler(job["payload"]), JOB_LEASE_SECONDS)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if job["attempts"] >= job["max_attempts"]:
+                await self.dead_letter(job, lease, error)
+                return
+            delay = min(JOB_BACKOFF_MAX_SECONDS, JOB_BACKOFF_BASE_SECONDS * 2 ** (job["attempts"] - 1))
+            run_at = datetime.utcnow() + timedelta(seconds=delay * random.uniform(0.5, 1))
+            await db.jobs.update_one(
+                lease, {"$set": {"status": "queued", "run_at": run_at, "last_error": error}}
+            )
+            self.retried += 1
+            logger.warning("Job %s (%s) failed, retrying: %s", job["id"], job["type"], error)
+            return
+
+        await db.jobs.delete_one(lease)
+        self.completed += 1
+        self._completions.append(time.monotonic())
+
+    async def dead_letter(self, job: dict, lease: dict, error: str):
+        job = {**job, "status": "dead", "last_error": error, "failed_at": datetime.utcnow()}
+        job.pop("_id", None)
+        await db.dead_jobs.insert_one(job)
+        await db.jobs.delete_one(lease)
+        self.dead_lettered += 1
+        logger.error("Job %s (%s) dead-lettered: %s", job["id"], job["type"], error)
+
+    async def work(self):
+        while True:
+            try:
+                job = await self.lease()
+                if job is None:
+                    await asyncio.sleep(JOB_POLL_INTERVAL)
+                    continue
+                await self.run_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Job worker error")
+                await asyncio.sleep(JOB_POLL_INTERVAL)
+
+    async def start(self, workers: int):
+        try:
+            await db.jobs.create_index([("status", 1), ("run_at", 1)])
+            await db.jobs.create_index([("status", 1), ("lease_expires_at", 1)])
+        except Exception:
+            logger.exception("Could not create job queue indexes")
+        self.workers = [asyncio.create_task(self.work()) for _ in range(workers)]
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+job_queue = JobQueue()
+
+async def enqueue_event_invites(event_id: str, corporate_ids: List[str]):
+    # One job per invitee, so a failed delivery is retried without
+    # re-notifying the corporates that already got theirs.
+    await job_queue.enqueue_many(
+        "notify_event_invite",
+        [{"event_id": event_id, "corporate_id": corporate_id} for corporate_id in corporate_ids],
+    )
+
+@job_queue.handler("notify_event_invite")
+async def notify_event_invite(payload: dict):
+    event = await RequestLoader().load("events", payload["event_id"])
+    if not event:
+        return
+    await notifier.send(
+        payload["corporate_id"],
+        f"Invitation: {event['title']}",
+        f"{event['ngo_name']} has invited you to {event['title']} at {event['location']}.",
+    )
+
+@job_queue.handler("notify_connection")
+async def notify_connection(payload: dict):
+    loader = RequestLoader()
+    connection = await loader.load("connections", payload["connection_id"])
+    if not connection:
+        return
+    business, corporate = await asyncio.gather(
+        loader.load("businesses", connection["business_id"]),
+        loader.load("users", connection["corporate_id"]),
+    )
+    if not business or not corporate:
+        return
+    corporate_name = corporate.get("organization") or corporate["name"]
+    await notifier.send(
+        business["owner_id"],
+        f"New interest in {business['name']}",
+        f"{corporate_name} is interested in partnering with {business['name']}.",
+    )
+
+@job_queue.handler("propagate_business")
+async def propagate_business(payload: dict):
+    # Re-read the business so that out-of-order fan-outs of two quick edits
+    # still converge on the latest values, and a retried job is harmless.
+    business_id = payload["business_id"]
+    business = await db.businesses.find_one({"id": business_id})
+    if not business:
+        return
+    update = {
+        "$set": {
+            f"participating_businesses.$[b].{embedded}": business[field]
+            for field, embedded in EMBEDDED_BUSINESS_FIELDS.items()
+        }
+    }
+    modified = await fan_out_to_events(
+        {"participating_businesses.business_id": business_id},
+        update,
+        array_filters=[{"b.business_id": business_id}],
+    )
+    logger.info("Propagated business %s to %d events", business_id, modified)
+
+@job_queue.handler("propagate_ngo_name")
+async def propagate_ngo_name(payload: dict):
+    user_id = payload["user_id"]
+    user = await db.users.find_one({"id": user_id})
+    if not user:
+        return
+    modified = await fan_out_to_events({"ngo_id": user_id}, {"$set": {"ngo_name": user["name"]}})
+    logger.info("Propagated NGO name for %s to %d events", user_id, modified)
+
+# Hot/cold archival
+# Completed events older than the retention window, with their connections,
+# are moved out of the hot collections so everyday queries only scan live data.
+ARCHIVE_COLLECTIONS = {"events": "events_archive", "connections": "connections_archive"}
+ARCHIVE_RETENTION_DAYS = int(os.environ.get('ARCHIVE_RETENTION_DAYS', 365))
+ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', 500))
+ARCHIVE_INTERVAL_SECONDS = float(os.environ.get('ARCHIVE_INTERVAL_SECONDS', 3600))
+
+async def find_all(collection: str, query: dict, include_archived: bool = False, length: int = 1000) -> List[dict]:
+    docs = await db[collection].find(query).to_list(length)
+    if include_archived:
+        # A document can briefly exist in both while its batch is being moved
+        seen = {doc["id"] for doc in docs}
+        archived = await db[ARCHIVE_COLLECTIONS[collection]].find(query).to_list(length)
+        docs += [doc for doc in archived if doc["id"] not in seen]
+    return docs
+
+async def distinct_all(collection: str, field: str, query: dict, include_archived: bool = False) -> list:
+    values = await db[collection].distinct(field, query)
+    if include_archived:
+        values = list(set(values) | set(await db[ARCHIVE_COLLECTIONS[collection]].distinct(field, query)))
+    return values
+
+async def archive_connections(event_ids: List[str]):
+    # Paged, since popular events can have any number of connections. Each
+    # page is deleted once copied, so re-querying from the start moves on.
+    while True:
+        connections = await db.connections.find(
+            {"event_id": {"$in": event_ids}}, {"_id": 0}
+        ).limit(ARCHIVE_BATCH_SIZE).to_list(ARCHIVE_BATCH_SIZE)
+        if not connections:
+            break
+        await db.connections_archive.bulk_write(
+            [ReplaceOne({"id": c["id"]}, c, upsert=True) for c in connections], ordered=False
+        )
+        await db.connections.delete_many({"id": {"$in": [c["id"] for c in connections]}})
+
+@job_queue.handler("archive_completed_events")
+async def archive_completed_events(payload: dict):
+    # One batch per job keeps each run well inside the job lease; a full
+    # batch enqueues a follow-up job to continue the backlog.
+    retention_days = payload.get("retention_days", ARCHIVE_RETENTION_DAYS)
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    events = await db.events.find(
+        {"status": "completed", "date": {"$lt": cutoff}}, {"_id": 0}
+    ).limit(ARCHIVE_BATCH_SIZE).to_list(ARCHIVE_BATCH_SIZE)
+    if not events:
+        return
+    event_ids = [e["id"] for e in events]
+
+    # Copy before deleting, with upserts, so a batch interrupted halfway
+    # (or run by two workers at once) is simply redone on the next pass.
+    await db.events_archive.bulk_write(
+        [ReplaceOne({"id": e["id"]}, e, upsert=True) for e in events], ordered=False
+    )
+    await archive_connections(event_ids)
+    await db.events.delete_many({"id": {"$in": event_ids}})
+    await invalidate_cached("events", event_ids)
+    # Sweep again for connections created while the batch was moving
+    await archive_connections(event_ids)
+    logger.info("Archived %d completed events older than %s", len(events), cutoff)
+
+    if len(events) == ARCHIVE_BATCH_SIZE:
+        await job_queue.enqueue("archive_completed_events", {"retention_days": retention_days})
+
+async def schedule_archival():
+    while True:
+        try:
+            if not await db.jobs.find_one({"type": "archive_completed_events"}):
+                await job_queue.enqueue("archive_completed_events", {})
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Could not schedule archival")
+        await asyncio.sleep(ARCHIVE_INTERVAL_SECONDS)
+
 # Routes
 @api_router.get("/")
 async def root():
@@ -200,6 +967,18 @@ async def login(login_data: UserLogin):
     
     return {"access_token": access_token, "token_type": "bearer", "user": user_obj}
 
+# User Routes
+@api_router.patch("/users/me", response_model=User)
+async def update_me(user_data: UserUpdate, current_user: User = Depends(get_current_user)):
+    changes = user_data.dict(exclude_unset=True, exclude_none=True)
+    version = changes.pop("version")
+    user = await apply_versioned_update("users", current_user.id, version, changes)
+
+    if current_user.role == UserRole.NGO and "name" in changes and changes["name"] != current_user.name:
+        await job_queue.enqueue("propagate_ngo_name", {"user_id": current_user.id})
+
+    return User(**user)
+
 # Business Routes
 @api_router.post("/businesses", response_model=Business)
 async def create_business(business_data: BusinessCreate, current_user: User = Depends(get_current_user)):
@@ -214,7 +993,11 @@ async def create_business(business_data: BusinessCreate, current_user: User = De
     return business
 
 @api_router.get("/businesses", response_model=List[Business])
-async def get_businesses():
+async def get_businesses(ids: Optional[str] = None, loader: RequestLoader = Depends(get_loader)):
+    if ids is not None:
+        businesses = await loader.load_many("businesses", parse_ids(ids))
+        return [Business(**business) for business in businesses if business]
+
     businesses = await db.businesses.find().to_list(1000)
     return [Business(**business) for business in businesses]
 
@@ -223,6 +1006,34 @@ async def get_my_businesses(current_user: User = Depends(get_current_user)):
     businesses = await db.businesses.find({"owner_id": current_user.id}).to_list(1000)
     return [Business(**business) for business in businesses]
 
+@api_router.get("/businesses/{business_id}", response_model=Business)
+async def get_business(business_id: str, loader: RequestLoader = Depends(get_loader)):
+    business = await loader.load("businesses", business_id)
+    if not business:
+        raise HTTPException(status_code=404, detail="Business not found")
+    return Business(**business)
+
+@api_router.patch("/businesses/{business_id}", response_model=Business)
+async def update_business(
+    business_id: str,
+    business_data: BusinessUpdate,
+    current_user: User = Depends(get_current_user),
+):
+    existing = await db.businesses.find_one({"id": business_id})
+    if not existing:
+        raise HTTPException(status_code=404, detail="Business not found")
+    if existing["owner_id"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Only the owner can update this business")
+
+    changes = business_data.dict(exclude_unset=True, exclude_none=True)
+    version = changes.pop("version")
+    business = await apply_versioned_update("businesses", business_id, version, changes)
+
+    if any(business[field] != existing[field] for field in EMBEDDED_BUSINESS_FIELDS):
+        await job_queue.enqueue("propagate_business", {"business_id": business_id})
+
+    return Business(**business)
+
 # Event Routes
 @api_router.post("/events", response_model=Event)
 async def create_event(event_data: EventCreate, current_user: User = Depends(get_current_user)):
@@ -232,42 +1043,87 @@ async def create_event(event_data: EventCreate, current_user: User = Depends(get
     event_dict = event_data.dict()
     event_dict["ngo_id"] = current_user.id
     event_dict["ngo_name"] = current_user.name
+    event_dict["participating_businesses"] = await embed_businesses(
+        list(dict.fromkeys(b["business_id"] for b in event_dict["participating_businesses"]))
+    )
     event = Event(**event_dict)
     
     await db.events.insert_one(event.dict())
+    await enqueue_event_invites(event.id, event.invited_corporates)
     return event
 
 @api_router.get("/events", response_model=List[Event])
-async def get_events():
-    events = await db.events.find().to_list(1000)
+async def get_events(
+    ids: Optional[str] = None,
+    include_archived: bool = False,
+    loader: RequestLoader = Depends(get_loader),
+):
+    if ids is not None:
+        event_ids = parse_ids(ids)
+        events = await loader.load_many("events", event_ids)
+        if include_archived:
+            archived = await loader.load_many("events_archive", [i for i, e in zip(event_ids, events) if not e])
+            archived_iter = iter(archived)
+            events = [event or next(archived_iter) for event in events]
+        return [Event(**event) for event in events if event]
+
+    events = await find_all("events", {}, include_archived)
     return [Event(**event) for event in events]
 
 @api_router.get("/events/my", response_model=List[Event])
-async def get_my_events(current_user: User = Depends(get_current_user)):
+async def get_my_events(include_archived: bool = False, current_user: User = Depends(get_current_user)):
     if current_user.role == UserRole.NGO:
-        events = await db.events.find({"ngo_id": current_user.id}).to_list(1000)
+        events = await find_all("events", {"ngo_id": current_user.id}, include_archived)
     elif current_user.role == UserRole.CORPORATE:
-        events = await db.events.find({"invited_corporates": current_user.id}).to_list(1000)
+        events = await find_all("events", {"invited_corporates": current_user.id}, include_archived)
     else:
         # For business owners, find events where their business is participating
         businesses = await db.businesses.find({"owner_id": current_user.id}).to_list(1000)
         business_ids = [b["id"] for b in businesses]
-        events = await db.events.find({"participating_businesses.business_id": {"$in": business_ids}}).to_list(1000)
+        events = await find_all(
+            "events", {"participating_businesses.business_id": {"$in": business_ids}}, include_archived
+        )
     
     return [Event(**event) for event in events]
 
 @api_router.get("/events/{event_id}", response_model=Event)
-async def get_event(event_id: str):
-    event = await db.events.find_one({"id": event_id})
+async def get_event(event_id: str, include_archived: bool = False, loader: RequestLoader = Depends(get_loader)):
+    event = await loader.load("events", event_id)
+    if not event and include_archived:
+        event = await loader.load("events_archive", event_id)
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return Event(**event)
 
+@api_router.patch("/events/{event_id}", response_model=Event)
+async def update_event(event_id: str, event_data: EventUpdate, current_user: User = Depends(get_current_user)):
+    existing = await db.events.find_one({"id": event_id})
+    if not existing:
+        raise HTTPException(status_code=404, detail="Event not found")
+    if existing["ngo_id"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Only the organizing NGO can update this event")
+
+    changes = event_data.dict(exclude_unset=True, exclude_none=True)
+    version = changes.pop("version")
+    if "participating_business_ids" in changes:
+        changes["participating_businesses"] = await embed_businesses(
+            list(dict.fromkeys(changes.pop("participating_business_ids")))
+        )
+    event = await apply_versioned_update("events", event_id, version, changes)
+
+    new_invites = [c for c in event["invited_corporates"] if c not in existing["invited_corporates"]]
+    await enqueue_event_invites(event_id, new_invites)
+
+    return Event(**event)
+
 # Connection Routes
 @api_router.post("/connections", response_model=Connection)
 async def create_connection(connection_data: ConnectionCreate, current_user: User = Depends(get_current_user)):
     if current_user.role != UserRole.CORPORATE:
         raise HTTPException(status_code=403, detail="Only corporates can express interest")
+    # Only live events; archived ones have left the hot set for good
+    if not await db.events.find_one({"id": connection_data.event_id}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Event not found")
     
     connection_dict = connection_data.dict()
     connection_dict["corporate_id"] = current_user.id
@@ -280,25 +1136,177 @@ async def create_connection(connection_data: ConnectionCreate, current_user: Use
         {"id": connection_data.event_id},
         {"$push": {"connections_made": connection.dict()}}
     )
+    await invalidate_cached("events", [connection_data.event_id])
+    await job_queue.enqueue("notify_connection", {"connection_id": connection.id})
     
     return connection
 
 @api_router.get("/connections", response_model=List[Connection])
-async def get_connections(current_user: User = Depends(get_current_user)):
+async def get_connections(include_archived: bool = False, current_user: User = Depends(get_current_user)):
     if current_user.role == UserRole.CORPORATE:
-        connections = await db.connections.find({"corporate_id": current_user.id}).to_list(1000)
+        connections = await find_all("connections", {"corporate_id": current_user.id}, include_archived)
     elif current_user.role == UserRole.BUSINESS_OWNER:
         businesses = await db.businesses.find({"owner_id": current_user.id}).to_list(1000)
         business_ids = [b["id"] for b in businesses]
-        connections = await db.connections.find({"business_id": {"$in": business_ids}}).to_list(1000)
+        connections = await find_all("connections", {"business_id": {"$in": business_ids}}, include_archived)
     else:
         # NGOs can see all connections for their events
-        events = await db.events.find({"ngo_id": current_user.id}).to_list(1000)
-        event_ids = [e["id"] for e in events]
-        connections = await db.connections.find({"event_id": {"$in": event_ids}}).to_list(1000)
+        event_ids = await distinct_all("events", "id", {"ngo_id": current_user.id}, include_archived)
+        connections = await find_all("connections", {"event_id": {"$in": event_ids}}, include_archived)
     
     return [Connection(**connection) for connection in connections]
 
+# Export Routes
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 500))
+
+# Column name -> pandas dtype. Fixed up front so every chunk of a Parquet
+# export produces the same schema regardless of which values are missing.
+EXPORT_COLUMNS = {
+    "events": {
+        "id": "string",
+        "ngo_id": "string",
+        "ngo_name": "string",
+        "title": "string",
+        "description": "string",
+        "initiative_type": "string",
+        "date": "datetime64[ns]",
+        "location": "string",
+        "target_audience": "string",
+        "status": "string",
+        "participating_business_ids": "string",
+        "invited_corporates": "string",
+        "connections_count": "Int64",
+        "created_at": "datetime64[ns]",
+    },
+    "businesses": {
+        "id": "string",
+        "owner_id": "string",
+        "name": "string",
+        "description": "string",
+        "category": "string",
+        "location": "string",
+        "revenue_range": "string",
+        "employees_count": "Int64",
+        "products": "string",
+        "image_url": "string",
+        "created_at": "datetime64[ns]",
+    },
+    "connections": {
+        "id": "string",
+        "event_id": "string",
+        "business_id": "string",
+        "corporate_id": "string",
+        "status": "string",
+        "notes": "string",
+        "created_at": "datetime64[ns]",
+    },
+}
+
+def flatten_export_row(collection: str, doc: dict) -> dict:
+    row = {column: doc.get(column) for column in EXPORT_COLUMNS[collection]}
+    if collection == "events":
+        row["participating_business_ids"] = ";".join(
+            b["business_id"] for b in doc.get("participating_businesses", [])
+        )
+        row["invited_corporates"] = ";".join(doc.get("invited_corporates", []))
+        row["connections_count"] = len(doc.get("connections_made", []))
+    elif collection == "businesses":
+        row["products"] = ";".join(doc.get("products", []))
+    return row
+
+def export_frame(collection: str, docs: List[dict]) -> pd.DataFrame:
+    columns = EXPORT_COLUMNS[collection]
+    rows = [flatten_export_row(collection, doc) for doc in docs]
+    return pd.DataFrame(rows, columns=list(columns)).astype(columns)
+
+async def export_query(collection: str, current_user: User, include_archived: bool) -> dict:
+    if collection == "events":
+        return {"ngo_id": current_user.id}
+    if collection == "businesses":
+        business_ids = await distinct_all(
+            "events", "participating_businesses.business_id", {"ngo_id": current_user.id}, include_archived
+        )
+        return {"id": {"$in": business_ids}}
+    event_ids = await distinct_all("events", "id", {"ngo_id": current_user.id}, include_archived)
+    return {"event_id": {"$in": event_ids}}
+
+async def iter_export_chunks(collection: str, query: dict, after: Optional[str], include_archived: bool):
+    # Documents are streamed in `id` order so that a client which lost the
+    # connection can resume by passing the last id it received as `after`.
+    if after:
+        query = {"$and": [query, {"id": {"$gt": after}}]}
+    if include_archived and collection in ARCHIVE_COLLECTIONS:
+        pipeline = [
+            {"$match": query},
+            {"$unionWith": {"coll": ARCHIVE_COLLECTIONS[collection], "pipeline": [{"$match": query}]}},
+            {"$sort": {"id": 1}},
+            {"$project": {"_id": 0}},
+        ]
+        cursor = db[collection].aggregate(pipeline, allowDiskUse=True, batchSize=EXPORT_CHUNK_SIZE)
+    else:
+        cursor = db[collection].find(query, {"_id": 0}, allow_disk_use=True).sort("id", 1).batch_size(EXPORT_CHUNK_SIZE)
+    while True:
+        docs = await cursor.to_list(length=EXPORT_CHUNK_SIZE)
+        if not docs:
+            break
+        yield export_frame(collection, docs)
+
+async def stream_csv(collection: str, query: dict, after: Optional[str], include_archived: bool):
+    # A resumed export is appended to the partial file, so skip the header
+    yield export_frame(collection, []).to_csv(index=False, header=not after)
+    async for frame in iter_export_chunks(collection, query, after, include_archived):
+        yield frame.to_csv(index=False, header=False, date_format="%Y-%m-%dT%H:%M:%S.%f")
+
+async def stream_parquet(collection: str, query: dict, after: Optional[str], include_archived: bool):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Each chunk becomes one row group; the sink is drained after every write
+    # so only a single chunk is ever held in memory.
+    sink = io.BytesIO()
+    schema = pa.Schema.from_pandas(export_frame(collection, []), preserve_index=False)
+    writer = pq.ParquetWriter(sink, schema)
+
+    def drain() -> bytes:
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    async for frame in iter_export_chunks(collection, query, after, include_archived):
+        writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+        yield drain()
+    writer.close()
+    yield drain()
+
+@api_router.get("/export/{collection}")
+async def export_collection(
+    collection: str,
+    format: str = Query("csv", pattern="^(csv|parquet)$"),
+    after: Optional[str] = None,
+    include_archived: bool = False,
+    current_user: User = Depends(get_current_user),
+):
+    if current_user.role != UserRole.NGO:
+        raise HTTPException(status_code=403, detail="Only NGOs can export reports")
+    if collection not in EXPORT_COLUMNS:
+        raise HTTPException(status_code=404, detail="Unknown export")
+
+    query = await export_query(collection, current_user, include_archived)
+    if format == "parquet":
+        body = stream_parquet(collection, query, after, include_archived)
+        media_type = "application/vnd.apache.parquet"
+    else:
+        body = stream_csv(collection, query, after, include_archived)
+        media_type = "text/csv"
+
+    filename = f"{collection}.{format}"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -317,6 +1325,111 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Startup warmup and probes
+warmup_state = {"ready": False, "db": "pending", "crypto": "pending", "error": None}
+
+async def ping_db(timeout: float = 2.0) -> bool:
+    try:
+        await asyncio.wait_for(client.admin.command("ping"), timeout)
+        return True
+    except Exception:
+        return False
+
+@app.on_event("startup")
+async def warm_up():
+    # Load the bcrypt backend off the event loop; passlib does it lazily on the
+    # first hash/verify otherwise, which lands on the first login after deploy.
+    try:
+        await asyncio.to_thread(pwd_context.handler().get_backend)
+        warmup_state["crypto"] = "ok"
+    except Exception as e:
+        warmup_state["crypto"] = "error"
+        warmup_state["error"] = str(e)
+        logger.exception("Password hashing backend failed to load")
+
+    # Concurrent pings each check out their own socket, so this opens (and
+    # completes TCP/TLS/auth for) MONGO_MIN_POOL_SIZE connections up front.
+    results = await asyncio.gather(
+        *(ping_db(timeout=10.0) for _ in range(max(MONGO_MIN_POOL_SIZE, 1)))
+    )
+    if all(results):
+        warmup_state["db"] = "ok"
+    else:
+        warmup_state["db"] = "error"
+        warmup_state["error"] = "Database ping failed during warmup"
+        logger.error("Database ping failed during warmup")
+
+    warmup_state["ready"] = warmup_state["db"] == "ok" and warmup_state["crypto"] == "ok"
+    logger.info("Warmup finished: %s, pool %s", warmup_state, pool_monitor.stats())
+
+@app.get("/healthz")
+async def healthz():
+    return {
+        "status": "ok",
+        "warmup": warmup_state,
+        "pool": pool_monitor.stats(),
+        "cache": {name: cache.stats() for name, cache in entity_caches.items()},
+        "jobs": job_queue.stats(),
+    }
+
+@app.get("/readyz")
+async def readyz():
+    # A worker whose warmup ping failed (e.g. the database was still starting)
+    # becomes ready once pings succeed; minPoolSize refills the pool meanwhile.
+    db_ok = await ping_db()
+    warmed = warmup_state["db"] != "pending" and warmup_state["crypto"] == "ok"
+    ready = warmed and db_ok
+    body = {
+        "ready": ready,
+        "db": "ok" if db_ok else "unreachable",
+        "warmup": warmup_state,
+        "pool": pool_monitor.stats(),
+    }
+    return JSONResponse(status_code=200 if ready else 503, content=body)
+
+invalidation_listener: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def start_invalidation_listener():
+    global invalidation_listener
+    if CACHE_INVALIDATION_CHANNEL:
+        invalidation_listener = asyncio.create_task(listen_for_invalidations())
+
+@app.on_event("startup")
+async def start_job_workers():
+    await job_queue.start(JOB_WORKERS)
+
+@app.on_event("startup")
+async def create_export_indexes():
+    # Exports stream in id order; without these every export (and resume)
+    # would block on an in-memory sort of the full result first.
+    try:
+        await db.events.create_index([("ngo_id", 1), ("id", 1)])
+        await db.businesses.create_index("id")
+        await db.connections.create_index("id")
+    except Exception:
+        logger.exception("Could not create export indexes")
+
+archival_scheduler: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def start_archival():
+    global archival_scheduler
+    try:
+        await db.events.create_index([("status", 1), ("date", 1)])
+        await db.events_archive.create_index("id", unique=True)
+        await db.connections_archive.create_index("id", unique=True)
+        await db.connections_archive.create_index("event_id")
+        await db.connections.create_index("event_id")
+    except Exception:
+        logger.exception("Could not create archive indexes")
+    archival_scheduler = asyncio.create_task(schedule_archival())
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    if invalidation_listener is not None:
+        invalidation_listener.cancel()
+    if archival_scheduler is not None:
+        archival_scheduler.cancel()
+    await job_queue.stop()
     client.close()
\ No newline at end of file
@@ -0,0 +1,107 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test_database")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+import server  # noqa: E402
+
+
+def matches(doc, query):
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = doc.get(key)
+            for op, operand in condition.items():
+                if op == "$lte" and not (value is not None and value <= operand):
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+        elif doc.get(key) != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return self.docs[:length]
+
+
+class FakeCollection:
+    """Just enough of a Motor collection for the code under test.
+
+    Every find() query is recorded in `queries`.
+    """
+
+    def __init__(self):
+        self.docs = []
+        self.queries = []
+
+    async def insert_one(self, doc):
+        self.docs.append(dict(doc))
+
+    async def insert_many(self, docs):
+        self.docs.extend(dict(doc) for doc in docs)
+
+    async def create_index(self, *args, **kwargs):
+        pass
+
+    def find(self, query=None, projection=None):
+        self.queries.append(query)
+        return FakeCursor([dict(d) for d in self.docs if matches(d, query or {})])
+
+    async def find_one(self, query):
+        return next((dict(d) for d in self.docs if matches(d, query)), None)
+
+    async def find_one_and_update(self, query, update, sort=None, return_document=None):
+        candidates = [d for d in self.docs if matches(d, query)]
+        for key, direction in reversed(sort or []):
+            candidates.sort(key=lambda d: d[key], reverse=direction < 0)
+        if not candidates:
+            return None
+        doc = candidates[0]
+        self._apply(doc, update)
+        return dict(doc)
+
+    async def update_one(self, query, update):
+        for doc in self.docs:
+            if matches(doc, query):
+                self._apply(doc, update)
+                return
+
+    async def delete_one(self, query):
+        for doc in self.docs:
+            if matches(doc, query):
+                self.docs.remove(doc)
+                return
+
+    def _apply(self, doc, update):
+        doc.update(update.get("$set", {}))
+        for key, delta in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + delta
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.collections = {}
+
+    def __getitem__(self, name):
+        return self.collections.setdefault(name, FakeCollection())
+
+    __getattr__ = __getitem__
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeDatabase()
+    monkeypatch.setattr(server, "db", db)
+    return db
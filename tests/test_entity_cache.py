@@ -0,0 +1,132 @@
+import asyncio
+
+import server
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def make_cache(max_entries=10, ttl=30, max_entry_bytes=10_000):
+    return server.EntityCache("test", max_entries, ttl, max_entry_bytes)
+
+
+def test_concurrent_misses_share_one_fetch():
+    cache = make_cache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"id": "a"}
+
+    async def main():
+        return await asyncio.gather(*(cache.get("a", loader) for _ in range(10)))
+
+    results = run(main())
+    assert calls == [1]
+    assert results == [{"id": "a"}] * 10
+    assert cache.stats()["coalesced"] == 9
+
+
+def test_get_many_fetches_only_misses_in_one_call():
+    cache = make_cache()
+    calls = []
+
+    async def loader(keys):
+        calls.append(sorted(keys))
+        return {key: {"id": key} for key in keys}
+
+    async def main():
+        await cache.get_many(["a"], loader)
+        return await cache.get_many(["a", "b", "c"], loader)
+
+    found = run(main())
+    assert calls == [["a"], ["b", "c"]]
+    assert found == {"a": {"id": "a"}, "b": {"id": "b"}, "c": {"id": "c"}}
+
+
+def test_invalidate_during_fetch_forces_refetch_and_drops_old_result():
+    cache = make_cache()
+    state = {"v": 1}
+
+    async def loader():
+        snapshot = dict(state)
+        await asyncio.sleep(0.02)
+        return snapshot
+
+    async def main():
+        before = asyncio.ensure_future(cache.get("a", loader))
+        await asyncio.sleep(0.005)
+        state["v"] = 2
+        cache.invalidate("a")
+        after = await cache.get("a", loader)
+        return await before, after, await cache.get("a", loader)
+
+    before, after, cached = run(main())
+    assert before == {"v": 1}
+    assert after == {"v": 2}
+    assert cached == {"v": 2}
+
+
+def test_failed_fetch_is_not_cached():
+    cache = make_cache()
+
+    async def broken():
+        raise RuntimeError("boom")
+
+    async def main():
+        try:
+            await cache.get("a", broken)
+        except RuntimeError:
+            pass
+        return await cache.get("a", lambda: asyncio.sleep(0, {"id": "a"}))
+
+    assert run(main()) == {"id": "a"}
+
+
+def test_oversize_entries_are_not_stored():
+    cache = make_cache(max_entry_bytes=100)
+
+    async def main():
+        await cache.get("big", lambda: asyncio.sleep(0, {"blob": "x" * 500}))
+        await cache.get("small", lambda: asyncio.sleep(0, {"id": "s"}))
+
+    run(main())
+    stats = cache.stats()
+    assert stats["oversize"] == 1
+    assert stats["entries"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = make_cache(max_entries=2)
+
+    async def main():
+        for key in ("a", "b"):
+            await cache.get(key, lambda key=key: asyncio.sleep(0, {"id": key}))
+        # Touch "a" so "b" becomes the least recently used
+        await cache.get("a", lambda: asyncio.sleep(0, None))
+        await cache.get("c", lambda: asyncio.sleep(0, {"id": "c"}))
+
+    run(main())
+    assert list(cache._entries) == ["a", "c"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_refetched():
+    cache = make_cache(ttl=0.01)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return {"id": "a"}
+
+    async def main():
+        await cache.get("a", loader)
+        await cache.get("a", loader)
+        await asyncio.sleep(0.02)
+        await cache.get("a", loader)
+
+    run(main())
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1
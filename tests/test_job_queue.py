@@ -0,0 +1,129 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+import server
+
+
+@pytest.fixture
+def queue():
+    queue = server.JobQueue()
+    queue.handlers = dict(server.job_queue.handlers)
+    return queue
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_lease_marks_job_running_and_hides_it_from_other_workers(fake_db, queue):
+    run(queue.enqueue("noop", {"n": 1}))
+
+    job = run(queue.lease())
+    assert job["status"] == "running"
+    assert job["attempts"] == 1
+    assert job["leased_by"] == server.WORKER_ID
+    assert job["lease_expires_at"] > datetime.utcnow()
+    assert run(queue.lease()) is None
+
+
+def test_expired_lease_is_picked_up_again(fake_db, queue):
+    run(queue.enqueue("noop", {}))
+    run(queue.lease())
+    fake_db.jobs.docs[0]["lease_expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+
+    job = run(queue.lease())
+    assert job is not None
+    assert job["attempts"] == 2
+
+
+def test_completed_job_is_deleted(fake_db, queue):
+    ran = []
+
+    @queue.handler("noop")
+    async def noop(payload):
+        ran.append(payload)
+
+    run(queue.enqueue("noop", {"n": 1}))
+    run(queue.run_job(run(queue.lease())))
+
+    assert ran == [{"n": 1}]
+    assert fake_db.jobs.docs == []
+    assert queue.stats()["completed"] == 1
+
+
+def test_failed_job_is_rescheduled_with_backoff(fake_db, queue, monkeypatch):
+    monkeypatch.setattr(server, "JOB_BACKOFF_BASE_SECONDS", 10)
+
+    @queue.handler("flaky")
+    async def flaky(payload):
+        raise RuntimeError("boom")
+
+    run(queue.enqueue("flaky", {}))
+    run(queue.run_job(run(queue.lease())))
+    first = dict(fake_db.jobs.docs[0])
+    assert first["status"] == "queued"
+    assert first["last_error"] == "RuntimeError: boom"
+    assert timedelta(seconds=4) < first["run_at"] - datetime.utcnow() <= timedelta(seconds=10)
+
+    # Not due yet, so no worker can take it
+    assert run(queue.lease()) is None
+
+    fake_db.jobs.docs[0]["run_at"] = datetime.utcnow()
+    run(queue.run_job(run(queue.lease())))
+    second = fake_db.jobs.docs[0]
+    assert second["attempts"] == 2
+    assert timedelta(seconds=9) < second["run_at"] - datetime.utcnow() <= timedelta(seconds=20)
+    assert queue.stats()["retried"] == 2
+
+
+def test_job_is_dead_lettered_after_max_attempts(fake_db, queue):
+    @queue.handler("broken")
+    async def broken(payload):
+        raise ValueError("nope")
+
+    run(queue.enqueue("broken", {"n": 1}, max_attempts=2))
+    run(queue.run_job(run(queue.lease())))
+    fake_db.jobs.docs[0]["run_at"] = datetime.utcnow()
+    run(queue.run_job(run(queue.lease())))
+
+    assert fake_db.jobs.docs == []
+    [dead] = fake_db.dead_jobs.docs
+    assert dead["status"] == "dead"
+    assert dead["attempts"] == 2
+    assert dead["last_error"] == "ValueError: nope"
+    assert queue.stats()["dead_lettered"] == 1
+
+
+def test_job_whose_lease_keeps_lapsing_is_dead_lettered(fake_db, queue):
+    run(queue.enqueue("noop", {}, max_attempts=1))
+    run(queue.lease())
+    fake_db.jobs.docs[0]["lease_expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+
+    run(queue.run_job(run(queue.lease())))
+
+    assert fake_db.jobs.docs == []
+    assert fake_db.dead_jobs.docs[0]["last_error"] == "Lease expired"
+
+
+def test_event_invites_are_delivered_one_job_per_invitee(fake_db, queue, monkeypatch):
+    notifier = server.InMemoryNotifier()
+    monkeypatch.setattr(server, "notifier", notifier)
+    monkeypatch.setattr(server, "job_queue", queue)
+    event_id = "event-invites-test"
+    fake_db.events.docs.append(
+        {"id": event_id, "title": "Haat", "ngo_name": "Seva", "location": "Pune"}
+    )
+
+    async def drain():
+        await server.enqueue_event_invites(event_id, ["corp-1", "corp-2"])
+        assert len(fake_db.jobs.docs) == 2
+        while (job := await queue.lease()) is not None:
+            await queue.run_job(job)
+
+    run(drain())
+
+    assert [n["user_id"] for n in notifier.sent] == ["corp-1", "corp-2"]
+    assert notifier.sent[0]["subject"] == "Invitation: Haat"
+    assert fake_db.jobs.docs == []
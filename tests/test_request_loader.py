@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+import server
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    monkeypatch.setattr(
+        server,
+        "entity_caches",
+        {name: server.EntityCache(name, 100, 30, 64 * 1024) for name in ("events", "businesses", "users")},
+    )
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def add_docs(collection, *ids):
+    collection.docs.extend({"id": i, "name": i.upper()} for i in ids)
+
+
+def test_loads_in_one_tick_make_one_query_per_collection(fake_db):
+    add_docs(fake_db.businesses, "b1", "b2")
+    add_docs(fake_db.events, "e1")
+
+    async def main():
+        loader = server.RequestLoader()
+        return await asyncio.gather(
+            loader.load("businesses", "b1"),
+            loader.load_many("businesses", ["b2", "missing"]),
+            loader.load("events", "e1"),
+        )
+
+    b1, (b2, missing), e1 = run(main())
+    assert (b1["name"], b2["name"], missing, e1["name"]) == ("B1", "B2", None, "E1")
+    assert len(fake_db.businesses.queries) == 1
+    assert sorted(fake_db.businesses.queries[0]["id"]["$in"]) == ["b1", "b2", "missing"]
+    assert len(fake_db.events.queries) == 1
+
+
+def test_repeated_ids_are_memoized(fake_db):
+    add_docs(fake_db.connections, "c1")
+
+    async def main():
+        loader = server.RequestLoader()
+        first, again = await asyncio.gather(loader.load("connections", "c1"), loader.load("connections", "c1"))
+        later = await loader.load("connections", "c1")
+        return first, again, later
+
+    first, again, later = run(main())
+    assert first is again is later
+    assert fake_db.connections.queries == [{"id": {"$in": ["c1"]}}]
+
+
+def test_cached_ids_are_not_queried(fake_db):
+    add_docs(fake_db.users, "u1", "u2")
+
+    async def main():
+        await server.RequestLoader().load("users", "u1")
+        return await server.RequestLoader().load_many("users", ["u1", "u2"])
+
+    u1, u2 = run(main())
+    assert (u1["name"], u2["name"]) == ("U1", "U2")
+    assert fake_db.users.queries == [{"id": {"$in": ["u1"]}}, {"id": {"$in": ["u2"]}}]
+
+
+def test_cancelled_caller_does_not_fail_other_waiters(fake_db):
+    add_docs(fake_db.connections, "c1")
+
+    async def main():
+        loader = server.RequestLoader()
+        cancelled = asyncio.ensure_future(loader.load("connections", "c1"))
+        waiting = asyncio.ensure_future(loader.load("connections", "c1"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        result = await waiting
+        # Memoized value is still usable after the cancellation
+        return cancelled.cancelled(), result, await loader.load("connections", "c1")
+
+    loop_errors = []
+
+    def record(loop, context):
+        loop_errors.append(context)
+
+    async def with_handler():
+        asyncio.get_running_loop().set_exception_handler(record)
+        outcome = await main()
+        await asyncio.sleep(0)
+        return outcome
+
+    was_cancelled, result, again = run(with_handler())
+    assert was_cancelled
+    assert result["name"] == "C1"
+    assert again is result
+    assert loop_errors == []
+
+
+def test_ids_route_keeps_requested_order_and_skips_unknown(fake_db):
+    for i in ("b1", "b2", "b3"):
+        fake_db.businesses.docs.append({
+            "id": i, "owner_id": "o", "name": i.upper(), "description": "d",
+            "category": "achar", "location": "Pune",
+        })
+
+    async def main():
+        return await server.get_businesses(ids="b3,unknown,b1,b3", loader=server.RequestLoader())
+
+    businesses = run(main())
+    assert [b.id for b in businesses] == ["b3", "b1"]
+    assert len(fake_db.businesses.queries) == 1